@@ -8,9 +8,23 @@ This module implements the core scoring logic that evaluates tasks based on:
 - Dependencies (tasks blocking others)
 """
 
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+import hashlib
+from typing import List, Dict, Any, Tuple, Optional, Set, Union
 import math
+import os
+import re
+import sys
+import threading
+
+import numpy as np
+import orjson
+
+from .scoring_kernels import HAS_NUMBA as _HAS_NUMBA, HIGH_MIN, MEDIUM_MIN, score_kernel
 
 
 # Predefined strategy weights
@@ -21,67 +35,209 @@ STRATEGIES = {
     'deadline': {'u': 0.60, 'i': 0.25, 'e': 0.05, 'd': 0.10},
 }
 
+# Strategy weights as (u, i, e, d) tuples, unpacked straight into the scorers
+STRATEGY_TUPLES = {
+    name: (w['u'], w['i'], w['e'], w['d']) for name, w in STRATEGIES.items()
+}
+
+# log(max_hours + 1) for the default 40-hour effort ceiling
+_LOG_MAX_PLUS1 = math.log(41.0)
+
+# Templates for the (code, value) pairs produced by explanation_codes
+_EXPLANATION_TEMPLATES = {
+    'overdue': "⚠️ OVERDUE by {} days",
+    'due_today': "🔥 Due TODAY",
+    'due_soon': "Due in {} days",
+    'high_importance': "High importance ({}/10)",
+    'medium_importance': "Medium importance ({}/10)",
+    'quick_win': "Quick win ({}h)",
+    'blocks_one': "Blocks {} task",
+    'blocks_many': "Blocks {} tasks",
+}
+
+# Priority labels and urgency statuses repeat on every result row; interned
+# once here so all rows share a single object per value
+_PRIORITY = {label: sys.intern(label) for label in ('Low', 'Medium', 'High')}
+_STATUS = {status: sys.intern(status) for status in (
+    'no_due_date', 'invalid_date', 'overdue', 'due_today', 'urgent', 'normal')}
+
+# Priority label codes (uint8) produced by the batch scorers, and the raw
+# score thresholds separating them (a displayed 50.00 / 75.00 and up)
+_PRIORITY_LABELS = (_PRIORITY['Low'], _PRIORITY['Medium'], _PRIORITY['High'])
+_PRIORITY_THRESHOLDS = np.array([MEDIUM_MIN, HIGH_MIN])
+
+# Normalized importance for each integer rating, indexed by the rating itself
+# (slot 0 is unused padding so ratings 1-10 index directly)
+_IMP_TABLE = tuple(max(0.0, (rating - 1) / 9) for rating in range(11))
+_IMP_TABLE_ARRAY = np.array(_IMP_TABLE)
+
+_INT16 = np.iinfo(np.int16)
+
+# Due dates in the shape strptime('%Y-%m-%d') accepts: 4-digit year, 1-2 digit
+# month and day (fromisoformat would also take '20251205' or '2025-W01-1')
+_DUE_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})', re.ASCII)
+
+# Days-left bucket edges: overdue (< 0), due today, urgent (1-3), normal (4+)
+_URGENCY_BINS = np.array([0, 1, 4], dtype=np.int16)
+
+# Below this many tasks thread start-up costs more than it saves
+_THREADED_MIN_TASKS = 2000
+
+# Below this many tasks the NumPy path beats the JIT kernel's dispatch cost
+_JIT_MIN_TASKS = 64
+
+# Recent analyze_tasks results, keyed by a digest of the request. Results are
+# stored as JSON bytes so every hit decodes a fresh, caller-owned copy.
+_ANALYSIS_CACHE_SIZE = 128
+_analysis_cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# Only plain JSON types round-trip exactly, so anything else (dates,
+# dataclasses, str/dict subclasses) raises and is left uncached
+_STRICT_JSON = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+
+def _resolve_weights(strategy: str) -> Tuple[float, float, float, float]:
+    """
+    Resolve a strategy name to its (u, i, e, d) weight tuple.
+    
+    Unknown strategies fall back to smart_balance.
+    """
+    return STRATEGY_TUPLES.get(strategy, STRATEGY_TUPLES['smart_balance'])
+
+
+@dataclass
+class AnalyzedTask:
+    """
+    A scored task row. Slotted to keep large batches compact; converted to a
+    plain dict only when the response is assembled.
+    """
+    __slots__ = ('id', 'title', 'due_date', 'estimated_hours', 'importance',
+                 'dependencies', 'score', 'priority_label', 'explanation',
+                 'in_circular_dependency', 'details')
+    
+    id: str
+    title: str
+    due_date: Optional[str]
+    estimated_hours: float
+    importance: int
+    dependencies: List[str]
+    score: float
+    priority_label: str
+    explanation: str
+    in_circular_dependency: bool
+    details: Optional[Dict[str, Any]]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the response dict; ``details`` is omitted unless computed."""
+        # Built directly: asdict() deep-copies every field and dominated
+        # analyze_tasks time on large batches
+        row = {name: getattr(self, name) for name in self.__slots__}
+        if row['details'] is None:
+            del row['details']
+        return row
+
 
 def normalize_importance(importance: int) -> float:
     """
     Normalize importance from 1-10 scale to 0-1 scale.
+    
+    Integer ratings in range are a table lookup; anything else uses the formula.
     """
+    if type(importance) is int and 1 <= importance <= 10:
+        return _IMP_TABLE[importance]
     return max(0.0, min(1.0, (importance - 1) / 9))
 
 
-def calculate_urgency_score(due_date_str: str, now: datetime) -> Tuple[float, Dict[str, Any]]:
+def parse_due_date(due_date: Union[str, date, None]) -> Optional[date]:
+    """
+    Parse a YYYY-MM-DD due date, returning None if missing or malformed.
+    
+    Accepts exactly what TaskSerializer accepts (it validates with this
+    function), so a date that passes validation is never scored as invalid.
+    Already-parsed date/datetime objects are passed through without re-parsing.
+    """
+    if not due_date:
+        return None
+    if isinstance(due_date, datetime):
+        return due_date.date()
+    if isinstance(due_date, date):
+        return due_date
+    match = _DUE_DATE_RE.fullmatch(due_date) if isinstance(due_date, str) else None
+    if match is None:
+        return None
+    try:
+        return date(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+def calculate_urgency_score(due_date: Union[str, date, None],
+                            now: datetime) -> Tuple[float, Dict[str, Any]]:
     """
     Calculate urgency score based on due date.
     
+    ``due_date`` may be a YYYY-MM-DD string or an already-parsed date.
+    
     Returns:
         Tuple of (score, metadata) where metadata contains explanation details
     """
-    if not due_date_str:
-        return 0.5, {'status': 'no_due_date', 'days_left': None}
+    if not due_date:
+        return 0.5, {'status': _STATUS['no_due_date'], 'days_left': None}
     
-    try:
-        # Parse date
-        due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date()
-        today = now.date()
-        days_left = (due_date - today).days
-        
-        if days_left < 0:
-            # Past due - max urgency with lateness bonus
-            late_by = abs(days_left)
-            lateness_bonus = min(late_by / 7, 1.0)  # Up to +1 bonus
-            score = 1.0 + lateness_bonus
-            return score, {
-                'status': 'overdue',
-                'days_left': days_left,
-                'late_by': late_by,
-                'score': score
-            }
-        elif days_left == 0:
-            return 1.0, {'status': 'due_today', 'days_left': 0}
-        elif days_left <= 3:
-            # Very urgent
-            score = 0.9 + (3 - days_left) * 0.033  # 0.9 to 1.0
-            return score, {'status': 'urgent', 'days_left': days_left}
-        else:
-            # Normal urgency decay over 30 days
-            score = max(0.0, min(1.0, 1 - days_left / 30))
-            return score, {'status': 'normal', 'days_left': days_left}
-            
-    except (ValueError, TypeError):
-        return 0.5, {'status': 'invalid_date', 'days_left': None}
+    parsed = parse_due_date(due_date)
+    if parsed is None:
+        return 0.5, {'status': _STATUS['invalid_date'], 'days_left': None}
+    
+    return urgency_from_days(parsed.toordinal() - now.toordinal())
 
 
+def urgency_from_days(days_left: int) -> Tuple[float, Dict[str, Any]]:
+    """
+    Calculate urgency score from a whole number of days until the due date.
+    
+    Returns:
+        Tuple of (score, metadata) as for calculate_urgency_score
+    """
+    if days_left < 0:
+        # Past due - max urgency with lateness bonus
+        late_by = abs(days_left)
+        lateness_bonus = min(late_by / 7, 1.0)  # Up to +1 bonus
+        score = 1.0 + lateness_bonus
+        return score, {
+            'status': _STATUS['overdue'],
+            'days_left': days_left,
+            'late_by': late_by,
+            'score': score
+        }
+    elif days_left == 0:
+        return 1.0, {'status': _STATUS['due_today'], 'days_left': 0}
+    elif days_left <= 3:
+        # Very urgent
+        score = 0.9 + (3 - days_left) * 0.033  # 0.9 to 1.0
+        return score, {'status': _STATUS['urgent'], 'days_left': days_left}
+    else:
+        # Normal urgency decay over 30 days
+        score = max(0.0, min(1.0, 1 - days_left / 30))
+        return score, {'status': _STATUS['normal'], 'days_left': days_left}
+
+
+@lru_cache(maxsize=512)
 def calculate_effort_score(estimated_hours: float, max_hours: float = 40) -> float:
     """
     Calculate effort score - lower hours = higher score (quick wins).
     
     Uses logarithmic scale to avoid extreme values for very small tasks.
+    Cached, since task lists reuse a handful of hour estimates (1, 2, 4, 8...).
     """
     if estimated_hours <= 0:
         return 1.0  # Instant task
     
+    denom = _LOG_MAX_PLUS1 if max_hours == 40 else math.log(max_hours + 1)
+    
     # Logarithmic scaling: quick tasks get high scores
-    score = 1 - (math.log(estimated_hours + 1) / math.log(max_hours + 1))
+    score = 1 - math.log1p(estimated_hours) / denom
     return max(0.0, min(1.0, score))
 
 
@@ -98,95 +254,232 @@ def calculate_dependency_score(task_id: str, dependency_map: Dict[str, int],
     return min(1.0, num_dependents / max_dependents)
 
 
-def detect_circular_dependencies(tasks: List[Dict]) -> Tuple[List[List[str]], List[str]]:
+def build_graph(tasks: List[Dict]) -> Tuple[Dict[str, List[str]], Dict[str, int], np.ndarray,
+                                          int, List[str]]:
     """
-    Detect circular dependencies using DFS.
+    Build the dependency graph and dependent counts in a single pass over tasks.
     
     Returns:
-        Tuple of (cycles, all_task_ids_in_cycles)
+        Tuple of (graph, id_to_idx, dep_counts, max_dependents, missing_dependencies)
+        where graph maps task_id -> list of tasks it depends on, id_to_idx maps
+        task_id -> its first position in ``tasks``, and dep_counts is an int32
+        array (by position) of how many tasks depend on each task. Tasks that
+        share an id share its dependent count.
     """
-    # Build adjacency list: task_id -> list of tasks it depends on
+    id_to_idx = {}
+    # Position whose count each task reports: the first task with the same id
+    # (or itself when it has no id), so duplicated ids all get the count
+    canonical = [id_to_idx.setdefault(task.get('id'), idx) if task.get('id') else idx
+                 for idx, task in enumerate(tasks)]
     graph = {}
-    all_task_ids = set()
+    # Position of the depended-on task for every resolved edge; counted in
+    # one bincount below instead of one array increment per edge
+    edge_targets = []
+    missing_deps = set()
     
     for task in tasks:
         task_id = task.get('id')
+        dependencies = task.get('dependencies', [])
         if task_id:
-            all_task_ids.add(task_id)
-            graph[task_id] = task.get('dependencies', [])
+            graph[task_id] = dependencies
+        
+        for dep_id in dependencies:
+            j = id_to_idx.get(dep_id)
+            if j is not None:
+                # dep_id is depended on by task_id
+                edge_targets.append(j)
+            else:
+                missing_deps.add(dep_id)
     
-    # DFS to find cycles
-    WHITE, GRAY, BLACK = 0, 1, 2
-    color = {task_id: WHITE for task_id in all_task_ids}
-    parent = {}
-    cycles = []
+    dep_counts = np.bincount(np.array(edge_targets, dtype=np.int32),
+                             minlength=len(tasks)).astype(np.int32)
+    if len(id_to_idx) < len(tasks):
+        dep_counts = dep_counts[canonical]
+    max_dependents = max(int(dep_counts.max(initial=0)), 1)
     
-    def dfs(node, path):
-        if color[node] == BLACK:
-            return
-        if color[node] == GRAY:
-            # Found cycle
-            cycle_start = path.index(node)
-            cycle = path[cycle_start:]
-            cycles.append(cycle)
-            return
-        
-        color[node] = GRAY
-        path.append(node)
-        
-        for neighbor in graph.get(node, []):
-            if neighbor in all_task_ids:  # Only follow valid dependencies
-                dfs(neighbor, path[:])
-        
-        color[node] = BLACK
+    return graph, id_to_idx, dep_counts, max_dependents, list(missing_deps)
+
+
+def detect_circular_dependencies(tasks: List[Dict],
+                                 graph: Optional[Dict[str, List[str]]] = None
+                                 ) -> Tuple[List[List[str]], Set[str]]:
+    """
+    Detect circular dependencies.
+    
+    A Kahn-style pass first peels off every task that no remaining task
+    depends on; in an acyclic graph that removes everything, so the common
+    case never builds a traversal stack. Whatever survives is handed to
+    Tarjan's strongly connected components to find the actual cycles, since
+    tasks downstream of a cycle also survive the peel without being in it.
+    Both passes are iterative and O(V + E).
+    
+    Pass the ``graph`` from build_graph to avoid rebuilding the adjacency list.
     
-    for task_id in all_task_ids:
-        if color[task_id] == WHITE:
-            dfs(task_id, [])
+    Returns:
+        Tuple of (cycles, all_task_ids_in_cycles)
+    """
+    # Most small task lists have no dependencies at all: nothing to traverse
+    if not any(task.get('dependencies') for task in tasks):
+        return [], set()
     
-    # Flatten cycles to get all affected task IDs
-    tasks_in_cycles = set()
-    for cycle in cycles:
-        tasks_in_cycles.update(cycle)
+    if graph is None:
+        graph = build_graph(tasks)[0]
     
-    return cycles, list(tasks_in_cycles)
+    # In-degree here = number of tasks that depend on a task
+    indegree = dict.fromkeys(graph, 0)
+    for dependencies in graph.values():
+        for dep_id in dependencies:
+            if dep_id in indegree:
+                indegree[dep_id] += 1
+    
+    queue = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+    while queue:
+        task_id = queue.popleft()
+        for dep_id in graph[task_id]:
+            if dep_id in indegree:
+                indegree[dep_id] -= 1
+                if indegree[dep_id] == 0:
+                    queue.append(dep_id)
+    
+    residual = {task_id for task_id, degree in indegree.items() if degree > 0}
+    if not residual:
+        return [], set()
+    
+    # Every task in a cyclic component sits on some cycle, but the component
+    # itself is not a path; report one real cycle through each
+    components = _strongly_connected_cycles(graph, residual)
+    cycles = [_walk_cycle(graph, component) for component in components]
+    return cycles, set().union(*components)
 
 
-def build_dependency_map(tasks: List[Dict]) -> Tuple[Dict[str, int], int, List[str]]:
+def _strongly_connected_cycles(graph: Dict[str, List[str]], nodes: Set[str]) -> List[List[str]]:
     """
-    Build a map of how many tasks depend on each task.
+    Find cycles among ``nodes`` with an iterative Tarjan SCC traversal.
     
-    Returns:
-        Tuple of (dependency_map, max_dependents, missing_dependencies)
+    Every component with more than one task, or a task that depends on
+    itself, is reported as a cycle. Components come back in stack order,
+    not as paths. Edges leaving ``nodes`` are ignored.
     """
-    dependency_map = {}
-    all_task_ids = {task.get('id') for task in tasks if task.get('id')}
-    missing_deps = set()
+    index = {}
+    lowlink = {}
+    stack_pos = {}  # node -> position in scc_stack, only while on the stack
+    scc_stack = []
+    cycles = []
     
-    for task in tasks:
-        task_id = task.get('id')
-        dependencies = task.get('dependencies', [])
+    for root in graph:
+        if root not in nodes or root in index:
+            continue
         
-        for dep_id in dependencies:
-            if dep_id not in all_task_ids:
-                missing_deps.add(dep_id)
+        index[root] = lowlink[root] = len(index)
+        stack_pos[root] = len(scc_stack)
+        scc_stack.append(root)
+        work = [(root, iter(graph[root]))]
+        
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in nodes:  # Only follow valid, unpeeled dependencies
+                    continue
+                if neighbor not in index:
+                    # Descend; this node's iterator resumes when we come back
+                    index[neighbor] = lowlink[neighbor] = len(index)
+                    stack_pos[neighbor] = len(scc_stack)
+                    scc_stack.append(neighbor)
+                    work.append((neighbor, iter(graph[neighbor])))
+                    break
+                if neighbor in stack_pos:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
             else:
-                # dep_id is depended on by task_id
-                dependency_map[dep_id] = dependency_map.get(dep_id, 0) + 1
+                # All neighbors explored - retreat to the parent
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                
+                if lowlink[node] == index[node]:
+                    # node is the root of a component: slice it off the stack
+                    start = stack_pos[node]
+                    scc = scc_stack[start:]
+                    del scc_stack[start:]
+                    for member in scc:
+                        del stack_pos[member]
+                    if len(scc) > 1 or node in graph[node]:
+                        cycles.append(scc)
+    
+    return cycles
+
+
+def _walk_cycle(graph: Dict[str, List[str]], component: List[str]) -> List[str]:
+    """
+    Follow dependencies inside a cyclic component until a task repeats,
+    returning that loop as a real path (each task depends on the next).
+    """
+    members = set(component)
+    position = {}
+    path = []
+    node = component[0]
+    while node not in position:
+        position[node] = len(path)
+        path.append(node)
+        # Every task in a cyclic component depends on another member
+        node = next(dep_id for dep_id in graph[node] if dep_id in members)
+    return path[position[node]:]
+
+
+def explanation_codes(days_left: Optional[int], importance: int, hours: float,
+                      num_dependents: int) -> List[Tuple[str, Any]]:
+    """
+    Collect the facts that explain a task's score as (code, value) pairs.
+    
+    ``days_left`` is None when the task has no (valid) due date. No strings
+    are built here; see format_explanation.
+    """
+    codes = []
     
-    max_dependents = max(dependency_map.values()) if dependency_map else 1
+    if days_left is not None:
+        if days_left < 0:
+            codes.append(('overdue', -days_left))
+        elif days_left == 0:
+            codes.append(('due_today', None))
+        elif days_left <= 3:
+            codes.append(('due_soon', days_left))
+    
+    if importance >= 8:
+        codes.append(('high_importance', importance))
+    elif importance >= 6:
+        codes.append(('medium_importance', importance))
+    
+    if hours <= 2:
+        codes.append(('quick_win', hours))
     
-    return dependency_map, max_dependents, list(missing_deps)
+    if num_dependents > 0:
+        codes.append(('blocks_many' if num_dependents > 1 else 'blocks_one', num_dependents))
+    
+    return codes
+
+
+def format_explanation(codes: List[Tuple[str, Any]]) -> str:
+    """
+    Render explanation codes into a human-readable sentence.
+    """
+    if not codes:
+        return "Standard priority task"
+    return '. '.join(_EXPLANATION_TEMPLATES[code].format(value) for code, value in codes)
 
 
-def compute_task_score(task: Dict, weights: Dict[str, float], 
+def compute_task_score(task: Dict, wu: float, wi: float, we: float, wd: float,
                        dependency_map: Dict[str, int], max_dependents: int,
-                       now: datetime) -> Tuple[float, str, Dict[str, Any]]:
+                       now: datetime, verbose: bool = False
+                       ) -> Tuple[float, str, List[Tuple[str, Any]], Optional[Dict[str, Any]]]:
     """
     Compute priority score for a single task.
     
+    The strategy weights are passed as plain floats (urgency, importance,
+    effort, dependency) so callers unpack the weights dict only once.
+    The per-component ``details`` breakdown is only built when ``verbose``.
+    
     Returns:
-        Tuple of (score, priority_label, details)
+        Tuple of (score, priority_label, explanation_codes, details or None)
     """
     task_id = task.get('id', '')
     
@@ -197,49 +490,28 @@ def compute_task_score(task: Dict, weights: Dict[str, float],
     d_score = calculate_dependency_score(task_id, dependency_map, max_dependents)
     
     # Weighted combination
-    raw_score = (
-        weights['u'] * u_score +
-        weights['i'] * i_score +
-        weights['e'] * e_score +
-        weights['d'] * d_score
-    )
+    raw_score = wu * u_score + wi * i_score + we * e_score + wd * d_score
     
     # Normalize to 0-100 for display
     final_score = raw_score * 100
     
-    # Determine priority label
-    if final_score >= 75:
-        priority_label = 'High'
-    elif final_score >= 50:
-        priority_label = 'Medium'
+    # Determine priority label from the score as displayed (2 places)
+    displayed_score = round(final_score, 2)
+    if displayed_score >= 75:
+        priority_label = _PRIORITY['High']
+    elif displayed_score >= 50:
+        priority_label = _PRIORITY['Medium']
     else:
-        priority_label = 'Low'
-    
-    # Build explanation
-    explanation_parts = []
-    
-    if urgency_meta['status'] == 'overdue':
-        explanation_parts.append(f"⚠️ OVERDUE by {urgency_meta['late_by']} days")
-    elif urgency_meta['status'] == 'due_today':
-        explanation_parts.append("🔥 Due TODAY")
-    elif urgency_meta['status'] == 'urgent':
-        explanation_parts.append(f"Due in {urgency_meta['days_left']} days")
-    
-    importance_val = task.get('importance', 5)
-    if importance_val >= 8:
-        explanation_parts.append(f"High importance ({importance_val}/10)")
-    elif importance_val >= 6:
-        explanation_parts.append(f"Medium importance ({importance_val}/10)")
-    
-    hours = task.get('estimated_hours', 0)
-    if hours <= 2:
-        explanation_parts.append(f"Quick win ({hours}h)")
+        priority_label = _PRIORITY['Low']
     
     num_dependents = dependency_map.get(task_id, 0)
-    if num_dependents > 0:
-        explanation_parts.append(f"Blocks {num_dependents} task{'s' if num_dependents > 1 else ''}")
+    explanation = explanation_codes(
+        urgency_meta['days_left'], task.get('importance', 5),
+        task.get('estimated_hours', 0), num_dependents
+    )
     
-    explanation = '. '.join(explanation_parts) if explanation_parts else "Standard priority task"
+    if not verbose:
+        return final_score, priority_label, explanation, None
     
     details = {
         'urgency_score': round(u_score, 3),
@@ -253,111 +525,363 @@ def compute_task_score(task: Dict, weights: Dict[str, float],
     return final_score, priority_label, explanation, details
 
 
+def _score_components(imp, hours, days_left, has_due, deps, max_dep, log_max):
+    """
+    Compute the strategy-independent component scores for a batch of tasks.
+    
+    Inputs may be compact, but every component is float64, matching the
+    scalar helpers above so batch and scalar scores agree.
+    
+    Returns:
+        Tuple of (urgency, importance, effort, dependency) float64 arrays
+    """
+    dl = days_left.astype(np.float64)
+    
+    # Branchless urgency: bucket days left (see _URGENCY_BINS), then pick each
+    # task's formula by bucket index
+    buckets = np.digitize(days_left, _URGENCY_BINS)
+    u = np.choose(buckets, [
+        1.0 + np.minimum(-dl / 7, 1.0),
+        np.ones(days_left.shape),
+        0.9 + (3 - dl) * 0.033,
+        np.clip(1 - dl / 30, 0.0, 1.0),
+    ])
+    u[~has_due] = 0.5
+    i = _IMP_TABLE_ARRAY[imp]
+    e = np.clip(1 - np.log1p(hours) / log_max, 0.0, 1.0)
+    d = deps / max_dep
+    return u, i, e, d
+
+
+def _score_arrays(imp, hours, days_left, has_due, deps, wu, wi, we, wd, max_dep, log_max):
+    """
+    Score a batch of tasks with NumPy vector ops (mirrors the scalar helpers above).
+    
+    Returns:
+        Tuple of (scores, label_codes) where label codes index _PRIORITY_LABELS
+    """
+    u, i, e, d = _score_components(imp, hours, days_left, has_due, deps, max_dep, log_max)
+    
+    # Same operation order as compute_task_score, so scores match it exactly
+    scores = (wu * u + wi * i + we * e + wd * d) * 100
+    labels = np.digitize(scores, _PRIORITY_THRESHOLDS).astype(np.uint8)
+    return scores, labels
+
+
+def _score_arrays_threaded(imp, hours, days_left, has_due, deps, *params):
+    """
+    Run _score_arrays over CPU-count slices of a large batch in a thread pool.
+    
+    NumPy releases the GIL inside its vector ops, so the slices score in parallel.
+    """
+    workers = min(os.cpu_count() or 1, len(imp))
+    if workers < 2:
+        return _score_arrays(imp, hours, days_left, has_due, deps, *params)
+    
+    bounds = np.linspace(0, len(imp), workers + 1, dtype=np.int64)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_score_arrays, imp[a:b], hours[a:b], days_left[a:b],
+                            has_due[a:b], deps[a:b], *params)
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        chunks = [future.result() for future in futures]
+    
+    return (np.concatenate([scores for scores, _ in chunks]),
+            np.concatenate([labels for _, labels in chunks]))
+
+
+def _pack_tasks(valid_tasks: List[Dict], now: datetime) -> Tuple[np.ndarray, ...]:
+    """
+    Pack validated tasks into the structure-of-arrays inputs of the batch scorers.
+    
+    Returns:
+        Tuple of (imp, hours, parsed_dates, delta, days_left, has_due):
+        int8 importance, the clamped float64 hours, the parsed date for
+        each distinct due_date string, exact int32 days left, int16 days
+        left for scoring, and the has-due-date mask
+    """
+    n = len(valid_tasks)
+    
+    # Clamp importance to 1-10 and hours to >= 0 in bulk; the float64 buffers
+    # accept numeric strings like int()/float() would, and the astype to int8
+    # truncates like int(). Non-finite importance (NaN would cast to 0) and
+    # NaN hours fall back to the usual defaults of 5 and 1.
+    imp_raw = np.fromiter((t['importance'] for t in valid_tasks), dtype=np.float64, count=n)
+    imp_raw[~np.isfinite(imp_raw)] = 5
+    np.clip(imp_raw, 1, 10, out=imp_raw)
+    imp = imp_raw.astype(np.int8)
+    hours_raw = np.fromiter((t['estimated_hours'] for t in valid_tasks), dtype=np.float64, count=n)
+    hours_raw[np.isnan(hours_raw)] = 1
+    np.maximum(hours_raw, 0.0, out=hours_raw)  # stays float64: no narrowing cast to overflow
+    
+    # Tasks often share due dates, so parse each distinct string once
+    parsed_dates = {
+        s: parse_due_date(s)
+        for s in {t.get('due_date') for t in valid_tasks if t.get('due_date')}
+    }
+    # Day ordinals (always >= 1, so 0 marks "no usable due date"); days left
+    # is then plain integer subtraction
+    ordinals = {key: parsed.toordinal() for key, parsed in parsed_dates.items() if parsed}
+    due = np.fromiter((ordinals.get(t.get('due_date'), 0) for t in valid_tasks),
+                      dtype=np.int32, count=n)
+    
+    has_due = due > 0
+    # int16 covers +/-89 years; urgency is already saturated well inside that.
+    # The symmetric clip keeps -days_left from overflowing.
+    delta = due - np.int32(now.toordinal())
+    days_left = np.where(has_due, np.clip(delta, -_INT16.max, _INT16.max), 0).astype(np.int16)
+    
+    return imp, hours_raw, parsed_dates, delta, days_left, has_due
+
+
 def analyze_tasks(tasks: List[Dict], strategy: str = 'smart_balance', 
-                  custom_weights: Dict = None) -> Dict[str, Any]:
+                  custom_weights: Dict = None, presanitized: bool = False,
+                  include_details: bool = False, top_n: Optional[int] = None) -> Dict[str, Any]:
     """
     Main function to analyze and score all tasks.
     
+    Set ``presanitized`` when the tasks already passed TaskSerializer
+    validation (ids and titles present, fields defaulted and in range) to
+    skip the per-task clean-up below. Set ``include_details`` to attach the
+    per-component score breakdown to every analyzed task. Set ``top_n`` to
+    return only the highest-priority tasks (0 returns none); ``total_tasks``
+    still counts every task that was scored.
+    
+    Results for recently seen inputs are served from a small in-process
+    cache (keyed on the inputs and today's date, since urgency depends on it).
+    The caller's task dicts are never modified, cached or not.
+    
     Returns:
         Dictionary with sorted tasks, warnings, and metadata
+    
+    Raises:
+        ValueError: if ``top_n`` is negative
+    """
+    if top_n is not None and top_n < 0:
+        raise ValueError(f"top_n must be >= 0, got {top_n}")
+    
+    # One clock read for both the key and the scoring, so a call spanning
+    # midnight can't cache one day's urgency under the next day's key
+    now = datetime.now()
+    key = _analysis_cache_key(tasks, strategy, custom_weights, now.date(),
+                              presanitized, include_details, top_n)
+    if key is not None:
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(key)
+            if cached is not None:
+                _analysis_cache.move_to_end(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    
+    result = _analyze_tasks(tasks, strategy, custom_weights, now, presanitized,
+                            include_details, top_n)
+    
+    if key is not None:
+        try:
+            encoded = orjson.dumps(result, option=_STRICT_JSON)
+        except TypeError:
+            return result
+        with _analysis_cache_lock:
+            _analysis_cache[key] = encoded
+            if len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+    
+    return result
+
+
+def _analysis_cache_key(tasks: List[Dict], strategy: str, custom_weights: Optional[Dict],
+                        today: date, *flags) -> Optional[tuple]:
+    """
+    Digest an analyze_tasks call into a cache key, or None if the inputs
+    are not plain JSON data.
     """
+    try:
+        payload = orjson.dumps([tasks, strategy, custom_weights],
+                               option=orjson.OPT_SORT_KEYS | _STRICT_JSON)
+    except TypeError:
+        return None
+    return hashlib.blake2b(payload, digest_size=16).digest(), flags, today
+
+
+def _analyze_tasks(tasks: List[Dict], strategy: str, custom_weights: Optional[Dict],
+                   now: datetime, presanitized: bool, include_details: bool,
+                   top_n: Optional[int]) -> Dict[str, Any]:
+    """
+    Uncached body of analyze_tasks.
+    """
+    # Resolve the strategy once and unpack it into plain floats for scoring
+    if custom_weights:
+        weights = custom_weights
+        wu, wi, we, wd = weights['u'], weights['i'], weights['e'], weights['d']
+    else:
+        weights = STRATEGIES.get(strategy, STRATEGIES['smart_balance'])
+        wu, wi, we, wd = _resolve_weights(strategy)
+    
     if not tasks:
         return {
             'analyzed': [],
             'warnings': [],
             'strategy': strategy,
-            'weights': STRATEGIES.get(strategy, STRATEGIES['smart_balance'])
+            'weights': weights,
+            'total_tasks': 0,
         }
     
-    # Validate and get weights
-    weights = custom_weights if custom_weights else STRATEGIES.get(strategy, STRATEGIES['smart_balance'])
-    
     warnings = []
-    now = datetime.now()
     
     # Validate tasks and collect issues
-    valid_tasks = []
-    for idx, task in enumerate(tasks):
-        if not task.get('id'):
-            warnings.append(f"Task at index {idx} missing 'id' field - skipped")
-            continue
-        if not task.get('title'):
-            warnings.append(f"Task '{task.get('id')}' missing 'title' - using default")
-            task['title'] = f"Task {task.get('id')}"
-        
-        # Set defaults for missing fields
-        if task.get('importance') is None:
-            task['importance'] = 5
-        if task.get('estimated_hours') is None:
-            task['estimated_hours'] = 1
-        
-        # Validate ranges
-        task['importance'] = max(1, min(10, int(task.get('importance', 5))))
-        task['estimated_hours'] = max(0, float(task.get('estimated_hours', 1)))
-        
-        if not isinstance(task.get('dependencies'), list):
-            task['dependencies'] = []
-        
-        valid_tasks.append(task)
+    if presanitized:
+        valid_tasks = list(tasks)
+    else:
+        valid_tasks = []
+        for idx, task in enumerate(tasks):
+            if not task.get('id'):
+                warnings.append(f"Task at index {idx} missing 'id' field - skipped")
+                continue
+            # Defaults go on a copy: the caller's dict must look the same
+            # whether or not this call is served from the cache
+            task = dict(task)
+            if not task.get('title'):
+                warnings.append(f"Task '{task.get('id')}' missing 'title' - using default")
+                task['title'] = f"Task {task.get('id')}"
+            
+            # Set defaults for missing fields (ranges are clamped in bulk below)
+            if task.get('importance') is None:
+                task['importance'] = 5
+            if task.get('estimated_hours') is None:
+                task['estimated_hours'] = 1
+            
+            if not isinstance(task.get('dependencies'), list):
+                task['dependencies'] = []
+            
+            valid_tasks.append(task)
     
     if not valid_tasks:
         return {
             'analyzed': [],
             'warnings': warnings + ['No valid tasks to analyze'],
             'strategy': strategy,
-            'weights': weights
+            'weights': weights,
+            'total_tasks': 0,
         }
     
+    # Build dependency graph and counts in one pass
+    graph, _, deps, max_dependents, missing_deps = build_graph(valid_tasks)
+    
     # Detect circular dependencies
-    cycles, tasks_in_cycles = detect_circular_dependencies(valid_tasks)
+    cycles, tasks_in_cycles = detect_circular_dependencies(valid_tasks, graph)
     if cycles:
         warnings.append(f"⚠️ Circular dependency detected: {' -> '.join(cycles[0] + [cycles[0][0]])}")
     
-    # Build dependency map
-    dependency_map, max_dependents, missing_deps = build_dependency_map(valid_tasks)
     if missing_deps:
         warnings.append(f"Missing dependency IDs referenced: {', '.join(missing_deps)}")
     
-    # Score all tasks
+    n = len(valid_tasks)
+    imp, hours_raw, parsed_dates, delta, days_left, has_due = _pack_tasks(valid_tasks, now)
+    importances = imp.tolist()
+    hours = hours_raw.tolist()
+    
+    if _HAS_NUMBA and n >= _JIT_MIN_TASKS:
+        score_batch = score_kernel
+    elif n > _THREADED_MIN_TASKS:
+        score_batch = _score_arrays_threaded
+    else:
+        score_batch = _score_arrays
+    scores, labels = score_batch(imp, hours_raw, days_left, has_due, deps,
+                                 wu, wi, we, wd, max_dependents, _LOG_MAX_PLUS1)
+    
+    # Sort by score (descending), then by dependency count, then by hours (ascending).
+    # Scores are ranked as displayed, i.e. after rounding to 2 places.
+    # np.lexsort is stable and treats its last key as the primary one.
+    score_list = scores.tolist()
+    dependents = deps.tolist()
+    
+    if top_n is not None and 0 < top_n < n // 4:
+        # Only the top few are wanted: partition out the top_n-th best raw
+        # score, keep every task that could round to a tie with it, and rank
+        # just those candidates
+        kth = float(np.partition(scores, n - top_n)[n - top_n])
+        candidates = np.flatnonzero(scores >= round(kth, 2) - 0.01)
+        candidate_scores = np.array([round(score_list[idx], 2) for idx in candidates.tolist()])
+        ranked = np.lexsort((hours_raw[candidates], -deps[candidates], -candidate_scores))
+        order = candidates[ranked[:top_n]].tolist()
+    else:
+        rounded_scores = np.array([round(score, 2) for score in score_list])
+        order = np.lexsort((hours_raw, -deps, -rounded_scores))[:top_n].tolist()
+    
+    # Build result rows only for the tasks being returned
     analyzed_tasks = []
-    for task in valid_tasks:
-        score, priority_label, explanation, details = compute_task_score(
-            task, weights, dependency_map, max_dependents, now
-        )
+    for idx in order:
+        task = valid_tasks[idx]
         
-        analyzed_task = {
-            'id': task['id'],
-            'title': task['title'],
-            'due_date': task.get('due_date'),
-            'estimated_hours': task['estimated_hours'],
-            'importance': task['importance'],
-            'dependencies': task['dependencies'],
-            'score': round(score, 2),
-            'priority_label': priority_label,
-            'explanation': explanation,
-            'in_circular_dependency': task['id'] in tasks_in_cycles,
-        }
+        details = None
+        if include_details:
+            # Reuse the parsed due date; unparseable strings stay as-is so they
+            # are still reported as invalid_date
+            clamped = {**task, 'importance': importances[idx], 'estimated_hours': hours[idx],
+                       'due_date': parsed_dates.get(task.get('due_date')) or task.get('due_date')}
+            details = compute_task_score(
+                clamped, wu, wi, we, wd, {task['id']: dependents[idx]}, max_dependents, now,
+                verbose=True
+            )[3]
         
-        analyzed_tasks.append(analyzed_task)
-    
-    # Sort by score (descending), then by dependency count, then by hours (ascending)
-    analyzed_tasks.sort(
-        key=lambda t: (
-            -t['score'],  # Higher score first
-            -dependency_map.get(t['id'], 0),  # More dependents first
-            t['estimated_hours']  # Fewer hours first
-        )
-    )
+        analyzed_tasks.append(AnalyzedTask(
+            id=task['id'],
+            title=task['title'],
+            due_date=task.get('due_date'),
+            estimated_hours=hours[idx],
+            importance=importances[idx],
+            dependencies=task['dependencies'],
+            score=round(score_list[idx], 2),
+            priority_label=_PRIORITY_LABELS[labels[idx]],
+            explanation=format_explanation(explanation_codes(
+                int(delta[idx]) if has_due[idx] else None,
+                importances[idx], hours[idx], dependents[idx]
+            )),
+            in_circular_dependency=task['id'] in tasks_in_cycles,
+            details=details,
+        ))
     
     return {
-        'analyzed': analyzed_tasks,
+        'analyzed': [analyzed_task.to_dict() for analyzed_task in analyzed_tasks],
         'warnings': warnings,
         'strategy': strategy,
         'weights': weights,
         'cycles': cycles if cycles else None,
+        'total_tasks': n,
     }
 
 
+def analyze_tasks_multi(tasks: List[Dict],
+                        strategies: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Score the same tasks under several strategies at once.
+    
+    The component scores (urgency, importance, effort, dependency) do not
+    depend on the strategy, so they are computed once as a (4, N) matrix and
+    every strategy is applied with a single (S, 4) @ (4, N) product. Tasks
+    must already be validated, as for analyze_tasks(..., presanitized=True).
+    
+    Returns:
+        Dictionary mapping strategy name -> float64 scores in task order
+    """
+    if strategies is None:
+        strategies = list(STRATEGIES)
+    if not tasks:
+        return {name: np.empty(0) for name in strategies}
+    
+    valid_tasks = list(tasks)
+    _, _, deps, max_dependents, _ = build_graph(valid_tasks)
+    imp, hours, _, _, days_left, has_due = _pack_tasks(valid_tasks, datetime.now())
+    
+    features = np.stack(_score_components(imp, hours, days_left, has_due, deps,
+                                          max_dependents, _LOG_MAX_PLUS1))
+    weights = np.array([_resolve_weights(name) for name in strategies])
+    all_scores = (weights @ features) * 100
+    
+    return dict(zip(strategies, all_scores))
+
+
 def get_top_suggestions(analyzed_result: Dict, count: int = 3) -> List[Dict]:
     """
     Get top N task suggestions with enhanced explanations.
@@ -4,6 +4,8 @@ Serializers for task validation and data processing.
 
 from rest_framework import serializers
 
+from .scoring import parse_due_date
+
 
 class TaskSerializer(serializers.Serializer):
     """Serializer for individual task validation."""
@@ -23,11 +25,8 @@ class TaskSerializer(serializers.Serializer):
     def validate_due_date(self, value):
         """Validate date format if provided."""
         if value and value.strip():
-            from datetime import datetime
-            try:
-                datetime.strptime(value, '%Y-%m-%d')
-                return value
-            except ValueError:
+            # Same parser the scorer uses, so valid dates are never scored as invalid
+            if parse_due_date(value) is None:
                 raise serializers.ValidationError(
                     "Date must be in YYYY-MM-DD format"
                 )
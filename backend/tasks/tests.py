@@ -3,19 +3,40 @@ Unit Tests for Smart Task Analyzer
 Tests the core scoring algorithm and edge case handling
 """
 
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+
 from django.test import TestCase
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import numpy as np
 from tasks.scoring import (
     normalize_importance,
+    parse_due_date,
     calculate_urgency_score,
+    urgency_from_days,
     calculate_effort_score,
     calculate_dependency_score,
     detect_circular_dependencies,
-    build_dependency_map,
+    build_graph,
     compute_task_score,
+    explanation_codes,
+    format_explanation,
     analyze_tasks,
-    STRATEGIES
+    analyze_tasks_multi,
+    STRATEGIES,
+    STRATEGY_TUPLES,
+    _HAS_NUMBA,
+    _analysis_cache,
+    _LOG_MAX_PLUS1,
+    _PRIORITY_LABELS,
+    _PRIORITY_THRESHOLDS,
+    _score_arrays,
+    _score_arrays_threaded,
 )
+from tasks.scoring_kernels import score_kernel
+from tasks.serializers import TaskSerializer
 
 
 class ImportanceNormalizationTests(TestCase):
@@ -40,6 +61,14 @@ class ImportanceNormalizationTests(TestCase):
         """Test importance 8 normalizes correctly"""
         score = normalize_importance(8)
         self.assertAlmostEqual(score, 0.777, places=2)
+    
+    def test_lookup_matches_formula(self):
+        """Test table lookups agree with the formula, which still covers other inputs"""
+        for rating in range(1, 11):
+            self.assertEqual(normalize_importance(rating), (rating - 1) / 9)
+        self.assertAlmostEqual(normalize_importance(5.5), 0.5)
+        self.assertEqual(normalize_importance(0), 0.0)
+        self.assertEqual(normalize_importance(12), 1.0)
 
 
 class UrgencyScoreTests(TestCase):
@@ -96,6 +125,35 @@ class UrgencyScoreTests(TestCase):
         self.assertEqual(score, 0.5)
         self.assertEqual(meta['status'], 'invalid_date')
     
+    def test_parsed_date_accepted(self):
+        """Test an already-parsed date scores the same as its string form"""
+        from_string = calculate_urgency_score("2025-12-02", self.now)
+        from_date = calculate_urgency_score(datetime(2025, 12, 2).date(), self.now)
+        
+        self.assertEqual(from_date, from_string)
+    
+    def test_due_date_formats_match_serializer(self):
+        """Test the scorer accepts exactly the due dates TaskSerializer accepts"""
+        cases = {
+            '2025-12-05': date(2025, 12, 5),
+            '2025-1-5': date(2025, 1, 5),
+            '20251205': None,
+            '2025-W01-1': None,
+            '2025-02-30': None,
+            '2025-12-05T10:00': None,
+        }
+        for value, expected in cases.items():
+            self.assertEqual(parse_due_date(value), expected, value)
+            serializer = TaskSerializer(data={'id': 't1', 'title': 'Task', 'due_date': value})
+            self.assertEqual(serializer.is_valid(), expected is not None, value)
+    
+    def test_day_offsets_match_dates(self):
+        """Test urgency_from_days agrees with the date-based calculation"""
+        for offset in (-40, -3, 0, 2, 3, 10, 45):
+            due_date = (self.now + timedelta(days=offset)).date()
+            self.assertEqual(urgency_from_days(offset),
+                             calculate_urgency_score(due_date, self.now))
+    
     def test_lateness_bonus_bounded(self):
         """Test overdue bonus is capped (doesn't grow infinitely)"""
         due_date = "2024-11-30"  # 365 days overdue
@@ -161,7 +219,7 @@ class DependencyScoreTests(TestCase):
 
 
 class CircularDependencyTests(TestCase):
-    """Test circular dependency detection using DFS"""
+    """Test circular dependency detection (Tarjan SCC)"""
     
     def test_no_cycle(self):
         """Test linear dependencies have no cycle"""
@@ -175,6 +233,17 @@ class CircularDependencyTests(TestCase):
         self.assertEqual(len(cycles), 0)
         self.assertEqual(len(tasks_in_cycles), 0)
     
+    def test_no_dependencies_skips_graph(self):
+        """Test dependency-free task lists return before building the graph"""
+        tasks = [{'id': 't1', 'dependencies': []}, {'id': 't2'}]
+        
+        with mock.patch('tasks.scoring.build_graph') as build:
+            cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        
+        build.assert_not_called()
+        self.assertEqual(cycles, [])
+        self.assertEqual(tasks_in_cycles, set())
+    
     def test_simple_cycle(self):
         """Test simple A->B->A cycle is detected"""
         tasks = [
@@ -209,10 +278,93 @@ class CircularDependencyTests(TestCase):
         cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
         
         self.assertNotIn('t3', tasks_in_cycles, "Independent task should not be flagged")
+    
+    def test_self_dependency_is_cycle(self):
+        """Test a task depending on itself is reported as a cycle"""
+        tasks = [
+            {'id': 't1', 'dependencies': ['t1']},
+            {'id': 't2', 'dependencies': ['t1']}
+        ]
+        cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        
+        self.assertEqual(cycles, [['t1']])
+        self.assertNotIn('t2', tasks_in_cycles)
+    
+    def test_separate_cycles_reported_once_each(self):
+        """Test each strongly connected component is reported exactly once"""
+        tasks = [
+            {'id': 't1', 'dependencies': ['t2']},
+            {'id': 't2', 'dependencies': ['t1', 't3']},
+            {'id': 't3', 'dependencies': ['t4']},
+            {'id': 't4', 'dependencies': ['t3']}
+        ]
+        cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        
+        self.assertEqual(sorted(sorted(c) for c in cycles), [['t1', 't2'], ['t3', 't4']])
+        self.assertEqual(tasks_in_cycles, {'t1', 't2', 't3', 't4'})
+    
+    def test_cycle_reached_from_many_tasks_reported_once(self):
+        """Test a cycle shared by several upstream tasks isn't duplicated"""
+        tasks = [{'id': f'u{i}', 'dependencies': ['c1']} for i in range(5)]
+        tasks += [
+            {'id': 'c1', 'dependencies': ['c2']},
+            {'id': 'c2', 'dependencies': ['c1']}
+        ]
+        cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(tasks_in_cycles, {'c1', 'c2'})
+    
+    def test_tasks_downstream_of_cycle_not_flagged(self):
+        """Test tasks a cycle depends on aren't reported as part of it"""
+        tasks = [
+            {'id': 't1', 'dependencies': ['t2', 't3']},
+            {'id': 't2', 'dependencies': ['t1']},
+            {'id': 't3', 'dependencies': ['t4']},
+            {'id': 't4', 'dependencies': []}
+        ]
+        cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(tasks_in_cycles, {'t1', 't2'})
+    
+    def test_reported_cycle_is_a_real_path(self):
+        """Test each reported cycle follows actual dependency edges"""
+        tasks = [
+            {'id': 'a', 'title': 'A', 'dependencies': ['b', 'c']},
+            {'id': 'b', 'title': 'B', 'dependencies': ['a']},
+            {'id': 'c', 'title': 'C', 'dependencies': ['a']}
+        ]
+        cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        
+        self.assertEqual(tasks_in_cycles, {'a', 'b', 'c'})
+        self.assertEqual(len(cycles), 1)
+        graph = {task['id']: task['dependencies'] for task in tasks}
+        path = cycles[0] + cycles[0][:1]
+        for task_id, dep_id in zip(path, path[1:]):
+            self.assertIn(dep_id, graph[task_id])
+        
+        warning = analyze_tasks(tasks)['warnings'][0]
+        self.assertIn(' -> '.join(path), warning)
+    
+    def test_deep_chain_beyond_recursion_limit(self):
+        """Test chains deeper than Python's recursion limit are handled"""
+        depth = sys.getrecursionlimit() * 5
+        tasks = [{'id': f't{i}', 'dependencies': [f't{i + 1}']} for i in range(depth)]
+        tasks.append({'id': f't{depth}', 'dependencies': []})
+        
+        cycles, _ = detect_circular_dependencies(tasks)
+        self.assertEqual(cycles, [])
+        
+        # Closing the chain turns it into one long cycle
+        tasks[-1]['dependencies'] = ['t0']
+        cycles, tasks_in_cycles = detect_circular_dependencies(tasks)
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(tasks_in_cycles), depth + 1)
 
 
-class DependencyMapTests(TestCase):
-    """Test dependency map building"""
+class DependencyGraphTests(TestCase):
+    """Test dependency graph building"""
     
     def test_build_simple_map(self):
         """Test building dependency map for simple dependencies"""
@@ -221,9 +373,9 @@ class DependencyMapTests(TestCase):
             {'id': 't2', 'dependencies': ['t1']},
             {'id': 't3', 'dependencies': ['t1']}
         ]
-        dep_map, max_deps, missing = build_dependency_map(tasks)
+        _, id_to_idx, dep_counts, max_deps, missing = build_graph(tasks)
         
-        self.assertEqual(dep_map['t1'], 2, "t1 is depended on by 2 tasks")
+        self.assertEqual(dep_counts[id_to_idx['t1']], 2, "t1 is depended on by 2 tasks")
         self.assertEqual(max_deps, 2)
         self.assertEqual(len(missing), 0)
     
@@ -233,7 +385,7 @@ class DependencyMapTests(TestCase):
             {'id': 't1', 'dependencies': ['t999']},
             {'id': 't2', 'dependencies': ['t1']}
         ]
-        dep_map, max_deps, missing = build_dependency_map(tasks)
+        _, _, _, _, missing = build_graph(tasks)
         
         self.assertIn('t999', missing)
         self.assertEqual(len(missing), 1)
@@ -244,10 +396,39 @@ class DependencyMapTests(TestCase):
             {'id': 't1', 'dependencies': []},
             {'id': 't2', 'dependencies': []}
         ]
-        dep_map, max_deps, missing = build_dependency_map(tasks)
+        _, _, dep_counts, max_deps, _ = build_graph(tasks)
         
-        self.assertEqual(len(dep_map), 0)
+        self.assertFalse(dep_counts.any())
         self.assertEqual(max_deps, 1)  # Default to 1 to avoid division by zero
+    
+    def test_graph_adjacency(self):
+        """Test graph maps each task to the tasks it depends on"""
+        tasks = [
+            {'id': 't1', 'dependencies': []},
+            {'id': 't2', 'dependencies': ['t1', 't999']}
+        ]
+        graph, id_to_idx, _, _, _ = build_graph(tasks)
+        
+        self.assertEqual(graph, {'t1': [], 't2': ['t1', 't999']})
+        self.assertEqual(id_to_idx, {'t1': 0, 't2': 1})
+    
+    def test_duplicate_ids_share_dependent_count(self):
+        """Test every task with a repeated id gets that id's dependent count"""
+        tasks = [
+            {'id': 't1', 'title': 'First copy', 'estimated_hours': 1, 'dependencies': []},
+            {'id': 't1', 'title': 'Second copy', 'estimated_hours': 1, 'dependencies': []},
+            {'id': 't2', 'title': 'Blocked', 'dependencies': ['t1']},
+        ]
+        _, id_to_idx, dep_counts, max_deps, _ = build_graph(tasks)
+        
+        self.assertEqual(dep_counts.tolist(), [1, 1, 0])
+        self.assertEqual(id_to_idx['t1'], 0)
+        self.assertEqual(max_deps, 1)
+        
+        rows = analyze_tasks([dict(t) for t in tasks])['analyzed']
+        for row in rows:
+            if row['id'] == 't1':
+                self.assertIn('Blocks 1 task', row['explanation'])
 
 
 class TaskScoreComputationTests(TestCase):
@@ -255,7 +436,8 @@ class TaskScoreComputationTests(TestCase):
     
     def setUp(self):
         self.now = datetime(2025, 11, 30)
-        self.weights = STRATEGIES['smart_balance']
+        weights = STRATEGIES['smart_balance']
+        self.weights = (weights['u'], weights['i'], weights['e'], weights['d'])
         self.dependency_map = {}
         self.max_dependents = 1
     
@@ -271,7 +453,7 @@ class TaskScoreComputationTests(TestCase):
         }
         
         score, priority, explanation, details = compute_task_score(
-            task, self.weights, self.dependency_map, self.max_dependents, self.now
+            task, *self.weights, self.dependency_map, self.max_dependents, self.now
         )
         
         self.assertGreater(score, 75, "Should be high priority")
@@ -289,7 +471,7 @@ class TaskScoreComputationTests(TestCase):
         }
         
         score, priority, explanation, details = compute_task_score(
-            task, self.weights, self.dependency_map, self.max_dependents, self.now
+            task, *self.weights, self.dependency_map, self.max_dependents, self.now
         )
         
         self.assertLess(score, 50, "Should be low priority")
@@ -307,11 +489,49 @@ class TaskScoreComputationTests(TestCase):
         }
         
         score, priority, explanation, details = compute_task_score(
-            task, self.weights, self.dependency_map, self.max_dependents, self.now
+            task, *self.weights, self.dependency_map, self.max_dependents, self.now
         )
         
         self.assertGreater(score, 90, "Overdue task should have very high score")
-        self.assertIn('OVERDUE', explanation)
+        self.assertIn('OVERDUE', format_explanation(explanation))
+    
+    def test_details_only_when_verbose(self):
+        """Test the component breakdown is built only on request"""
+        task = {'id': 't1', 'title': 'Task', 'due_date': '2025-12-02',
+                'estimated_hours': 1, 'importance': 10, 'dependencies': []}
+        
+        *_, details = compute_task_score(
+            task, *self.weights, self.dependency_map, self.max_dependents, self.now
+        )
+        self.assertIsNone(details)
+        
+        *_, details = compute_task_score(
+            task, *self.weights, self.dependency_map, self.max_dependents, self.now,
+            verbose=True
+        )
+        self.assertEqual(details['importance_score'], 1.0)
+        self.assertEqual(details['urgency_meta']['status'], 'urgent')
+
+
+class ExplanationTests(TestCase):
+    """Test explanation codes and their rendering"""
+    
+    def test_codes_for_overdue_blocking_task(self):
+        """Test codes capture each notable fact about a task"""
+        codes = explanation_codes(-4, 9, 1.5, 2)
+        
+        self.assertEqual(codes, [('overdue', 4), ('high_importance', 9),
+                                 ('quick_win', 1.5), ('blocks_many', 2)])
+        self.assertEqual(format_explanation(codes),
+                         "⚠️ OVERDUE by 4 days. High importance (9/10). "
+                         "Quick win (1.5h). Blocks 2 tasks")
+    
+    def test_standard_task_has_no_codes(self):
+        """Test an unremarkable task renders the default explanation"""
+        codes = explanation_codes(None, 5, 8.0, 0)
+        
+        self.assertEqual(codes, [])
+        self.assertEqual(format_explanation(codes), "Standard priority task")
 
 
 class AnalyzeTasksIntegrationTests(TestCase):
@@ -412,6 +632,343 @@ class AnalyzeTasksIntegrationTests(TestCase):
         analyzed = result['analyzed'][0]
         self.assertEqual(analyzed['importance'], 5)  # Default
         self.assertEqual(analyzed['estimated_hours'], 1)  # Default
+    
+    def test_batch_scores_match_single_task_scores(self):
+        """Test vectorized batch scoring agrees with compute_task_score"""
+        today = datetime.now().date()
+        tasks = [
+            {'id': f't{i}', 'title': f'Task {i}',
+             'due_date': (today + timedelta(days=i - 10)).isoformat(),
+             'estimated_hours': i % 7 + 0.5, 'importance': i % 10 + 1,
+             'dependencies': [f't{i - 1}'] if i else []}
+            for i in range(40)
+        ]
+        tasks.append({'id': 'nodate', 'title': 'No date', 'estimated_hours': 3.0,
+                      'importance': 4, 'dependencies': []})
+        
+        _, id_to_idx, dep_counts, max_deps, _ = build_graph(tasks)
+        dep_map = {tid: int(dep_counts[idx]) for tid, idx in id_to_idx.items()}
+        w = STRATEGIES['smart_balance']
+        expected = {
+            t['id']: compute_task_score(t, w['u'], w['i'], w['e'], w['d'],
+                                        dep_map, max_deps, datetime.now())
+            for t in tasks
+        }
+        
+        result = analyze_tasks([dict(t) for t in tasks])
+        
+        for analyzed in result['analyzed']:
+            score, priority, explanation, _ = expected[analyzed['id']]
+            self.assertAlmostEqual(analyzed['score'], score, places=1)
+            self.assertEqual(analyzed['priority_label'], priority)
+            self.assertEqual(analyzed['explanation'], format_explanation(explanation))
+    
+    def test_presanitized_matches_full_validation(self):
+        """Test the presanitized fast path scores clean input identically"""
+        tasks = [
+            {'id': 't1', 'title': 'Task 1', 'due_date': '2025-12-05',
+             'estimated_hours': 2.0, 'importance': 7, 'dependencies': ['t2']},
+            {'id': 't2', 'title': 'Task 2', 'due_date': None,
+             'estimated_hours': 6.0, 'importance': 4, 'dependencies': []}
+        ]
+        
+        checked = analyze_tasks([dict(t) for t in tasks])
+        trusted = analyze_tasks([dict(t) for t in tasks], presanitized=True)
+        
+        self.assertEqual(trusted['analyzed'], checked['analyzed'])
+    
+    def test_include_details(self):
+        """Test details are attached only when requested"""
+        tasks = [{'id': 't1', 'title': 'Task 1', 'importance': 8, 'dependencies': []}]
+        
+        self.assertNotIn('details', analyze_tasks([dict(t) for t in tasks])['analyzed'][0])
+        
+        analyzed = analyze_tasks([dict(t) for t in tasks], include_details=True)['analyzed'][0]
+        self.assertEqual(analyzed['details']['urgency_meta']['status'], 'no_due_date')
+    
+    def test_top_n_matches_head_of_full_ranking(self):
+        """Test top_n returns the same leading tasks as a full analysis"""
+        tasks = [
+            {'id': f't{i}', 'title': f'Task {i}', 'due_date': '2025-12-10',
+             'estimated_hours': i % 4 + 1, 'importance': i % 3 + 5,
+             'dependencies': [f't{i % 5}'] if i >= 5 else []}
+            for i in range(30)
+        ]
+        
+        full = analyze_tasks([dict(t) for t in tasks])
+        top = analyze_tasks([dict(t) for t in tasks], top_n=3)
+        
+        self.assertEqual(top['analyzed'], full['analyzed'][:3])
+        self.assertEqual(top['total_tasks'], 30)
+    
+    def test_top_n_zero_and_negative(self):
+        """Test top_n=0 returns no rows and a negative top_n is rejected"""
+        tasks = [{'id': f't{i}', 'title': f'Task {i}', 'dependencies': []} for i in range(40)]
+        
+        result = analyze_tasks([dict(t) for t in tasks], top_n=0)
+        self.assertEqual(result['analyzed'], [])
+        self.assertEqual(result['total_tasks'], 40)
+        
+        with self.assertRaises(ValueError):
+            analyze_tasks([dict(t) for t in tasks], top_n=-2)
+    
+    def test_top_n_partition_keeps_tie_order(self):
+        """Test the partitioned top_n path breaks score ties like the full sort"""
+        # Only 3 distinct importances and hours: many tasks tie on score
+        tasks = [
+            {'id': f't{i}', 'title': f'Task {i}', 'estimated_hours': i % 2 + 1,
+             'importance': i % 3 + 8, 'dependencies': []}
+            for i in range(400)
+        ]
+        
+        full = analyze_tasks([dict(t) for t in tasks])
+        
+        for top_n in (1, 5, 50, 150):
+            top = analyze_tasks([dict(t) for t in tasks], top_n=top_n)
+            self.assertEqual(top['analyzed'], full['analyzed'][:top_n])
+    
+    def test_explanations_rendered_only_for_returned_rows(self):
+        """Test explanation text is formatted just for the tasks returned"""
+        _analysis_cache.clear()
+        tasks = [{'id': f't{i}', 'title': f'Task {i}', 'importance': i % 10 + 1,
+                  'dependencies': []} for i in range(50)]
+        
+        with mock.patch('tasks.scoring.format_explanation',
+                        wraps=format_explanation) as render:
+            result = analyze_tasks(tasks, top_n=3)
+        
+        self.assertEqual(render.call_count, 3)
+        self.assertEqual(len(result['analyzed']), 3)
+    
+    def test_repeat_analysis_served_from_cache(self):
+        """Test an identical repeat call skips the analysis and returns a fresh copy"""
+        _analysis_cache.clear()
+        tasks = [
+            {'id': 't1', 'title': 'Task 1', 'importance': 8, 'dependencies': []},
+            {'id': 't2', 'title': 'Task 2', 'importance': 3, 'dependencies': ['t1']},
+        ]
+        
+        first = analyze_tasks([dict(t) for t in tasks], strategy='deadline')
+        first['analyzed'][0]['title'] = 'Changed'
+        with mock.patch('tasks.scoring.build_graph') as build:
+            second = analyze_tasks([dict(t) for t in tasks], strategy='deadline')
+        
+        build.assert_not_called()
+        self.assertEqual(second['analyzed'][0]['title'], 'Task 1')
+        self.assertEqual(second['total_tasks'], 2)
+    
+    def test_cache_keyed_on_strategy_and_weights(self):
+        """Test different strategies or weights are analyzed separately"""
+        _analysis_cache.clear()
+        tasks = [{'id': 't1', 'title': 'Task 1', 'importance': 10, 'dependencies': []}]
+        
+        analyze_tasks([dict(t) for t in tasks], strategy='fastest')
+        deadline = analyze_tasks([dict(t) for t in tasks], strategy='deadline')
+        custom = analyze_tasks([dict(t) for t in tasks],
+                               custom_weights={'u': 0.0, 'i': 1.0, 'e': 0.0, 'd': 0.0})
+        
+        self.assertEqual(deadline['strategy'], 'deadline')
+        self.assertEqual(custom['analyzed'][0]['score'], 100.0)
+        self.assertEqual(len(_analysis_cache), 3)
+    
+    def test_non_json_input_not_cached(self):
+        """Test inputs holding non-JSON values (e.g. date objects) bypass the cache"""
+        _analysis_cache.clear()
+        tasks = [{'id': 't1', 'title': 'Task 1', 'due_date': datetime.now().date(),
+                  'dependencies': []}]
+        
+        result = analyze_tasks(tasks)
+        
+        self.assertEqual(result['analyzed'][0]['due_date'], tasks[0]['due_date'])
+        self.assertEqual(len(_analysis_cache), 0)
+    
+    def test_inputs_untouched_on_miss_and_hit(self):
+        """Test defaults are never written into the caller's task dicts"""
+        _analysis_cache.clear()
+        
+        for _ in range(2):
+            tasks = [{'id': 'a'}]
+            result = analyze_tasks(tasks)
+            self.assertEqual(tasks, [{'id': 'a'}])
+            self.assertEqual(result['analyzed'][0]['title'], 'Task a')
+    
+    def test_cache_key_uses_scoring_clock(self):
+        """Test the cache key's date comes from the same clock read as scoring"""
+        _analysis_cache.clear()
+        before_midnight = datetime(2030, 1, 1, 23, 59, 59)
+        
+        with mock.patch('tasks.scoring.datetime') as clock:
+            clock.now.return_value = before_midnight
+            analyze_tasks([{'id': 't1', 'title': 'Task 1', 'dependencies': []}])
+        
+        clock.now.assert_called_once_with()
+        (key,) = _analysis_cache
+        self.assertEqual(key[-1], before_midnight.date())
+
+
+class BatchScoringTests(TestCase):
+    """Test the NumPy and JIT batch scorers agree"""
+    
+    def assert_batch_matches_scalar(self, n):
+        """Score n varied tasks in one batch and check every row against compute_task_score"""
+        now = datetime.now()
+        tasks = [
+            {'id': f't{k}', 'title': f'Task {k}',
+             'due_date': (None if k % 4 == 1 else
+                          (now + timedelta(days=k % 50 - 10)).strftime('%Y-%m-%d')),
+             'estimated_hours': (k % 9) * 0.7, 'importance': k % 10 + 1,
+             'dependencies': [f't{k // 3}'] if k % 3 and k // 3 != k else []}
+            for k in range(n)
+        ]
+        _, _, deps, max_dependents, _ = build_graph(tasks)
+        dependency_map = {task['id']: count for task, count in zip(tasks, deps.tolist())}
+        
+        # The last two weight sets put no-due-date tasks on exactly 75.0 and 50.0
+        weight_sets = list(STRATEGIES.values()) + [
+            {'u': 0.5, 'i': 0.5, 'e': 0.0, 'd': 0.0},
+            {'u': 1.0, 'i': 0.0, 'e': 0.0, 'd': 0.0},
+        ]
+        seen_scores = set()
+        for weights in weight_sets:
+            result = analyze_tasks([dict(t) for t in tasks], custom_weights=weights,
+                                   presanitized=True)
+            for row in result['analyzed']:
+                task = tasks[int(row['id'][1:])]
+                score, label, _, _ = compute_task_score(
+                    task, weights['u'], weights['i'], weights['e'], weights['d'],
+                    dependency_map, max_dependents, now)
+                self.assertEqual(row['score'], round(score, 2), row['id'])
+                self.assertEqual(row['priority_label'], label, row['id'])
+                seen_scores.add(row['score'])
+        
+        self.assertIn(75.0, seen_scores)
+        self.assertIn(50.0, seen_scores)
+    
+    def test_numpy_path_matches_scalar(self):
+        """Test NumPy batch scores and labels equal the scalar ones, thresholds included"""
+        self.assert_batch_matches_scalar(40)
+    
+    @skipUnless(_HAS_NUMBA, "numba not installed")
+    def test_kernel_path_matches_scalar(self):
+        """Test JIT kernel scores and labels equal the scalar ones, thresholds included"""
+        self.assert_batch_matches_scalar(200)
+    
+    def test_label_follows_displayed_score(self):
+        """Test a score displayed as 75.0 or 50.0 is labelled High or Medium"""
+        for raw, label in ((74.996, 'High'), (74.994, 'Medium'),
+                           (49.996, 'Medium'), (49.994, 'Low')):
+            codes = np.digitize(np.array([raw]), _PRIORITY_THRESHOLDS)
+            self.assertEqual(_PRIORITY_LABELS[codes[0]], label, raw)
+    
+    def test_label_independent_of_batch_size(self):
+        """Test the same task gets the same score and label on the NumPy and JIT paths"""
+        due = (datetime.now() + timedelta(days=45)).strftime('%Y-%m-%d')
+        task = {'title': 'Quick and important', 'due_date': due,
+                'estimated_hours': 0, 'importance': 10, 'dependencies': []}
+        
+        for n in (10, 100):
+            tasks = [dict(task, id=f't{k}') for k in range(n)]
+            row = analyze_tasks(tasks, strategy='smart_balance')['analyzed'][0]
+            self.assertEqual(row['score'], 50.0)
+            self.assertEqual(row['priority_label'], 'Medium')
+    
+    def test_huge_hours_score_without_warnings(self):
+        """Test hours far beyond float32 range get zero effort on every batch path, warning-free"""
+        task = {'title': 'Endless', 'estimated_hours': 1e300, 'importance': 5, 'dependencies': []}
+        w = STRATEGIES['smart_balance']
+        expected, _, _, _ = compute_task_score(task, w['u'], w['i'], w['e'], w['d'],
+                                               {}, 1, datetime.now())
+        
+        self.assertEqual(calculate_effort_score(1e300), 0.0)
+        for n in (10, 100, 2500):
+            tasks = [dict(task, id=f't{k}') for k in range(n)]
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                row = analyze_tasks(tasks, strategy='smart_balance')['analyzed'][0]
+            self.assertEqual(row['score'], round(expected, 2), n)
+            self.assertEqual(row['estimated_hours'], 1e300)
+    
+    def test_non_finite_inputs_use_defaults(self):
+        """Test NaN/infinite importance and NaN hours score like the defaults, warning-free"""
+        default = analyze_tasks([{'id': 't1', 'title': 'Task', 'dependencies': []}])['analyzed'][0]
+        
+        for n in (1, 100):
+            for bad in ({'importance': float('nan')}, {'importance': float('inf')},
+                        {'estimated_hours': float('nan')}):
+                tasks = [dict(bad, id=f't{k}', title='Task', dependencies=[]) for k in range(n)]
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error')
+                    row = analyze_tasks(tasks)['analyzed'][0]
+                self.assertEqual(row['importance'], 5, bad)
+                self.assertEqual(row['score'], default['score'], bad)
+    
+    @skipUnless(_HAS_NUMBA, "numba not installed")
+    def test_kernel_matches_numpy_path(self):
+        """Test the numba kernel reproduces the NumPy scores and labels"""
+        n = 200
+        args = (
+            (np.arange(n) % 10 + 1).astype(np.int8),
+            (np.arange(n) % 13).astype(np.float64),
+            (np.arange(n) - 50).astype(np.int16),
+            np.arange(n) % 5 != 0,
+            (np.arange(n) % 4).astype(np.int32),
+            0.35, 0.35, 0.15, 0.15, 3, _LOG_MAX_PLUS1,
+        )
+        
+        scores, labels = score_kernel(*args)
+        expected_scores, expected_labels = _score_arrays(*args)
+        
+        np.testing.assert_array_equal(scores, expected_scores)
+        np.testing.assert_array_equal(labels, expected_labels)
+    
+    @skipUnless(_HAS_NUMBA, "numba not installed")
+    def test_kernel_safe_from_concurrent_threads(self):
+        """Test request threads can run the kernel at the same time"""
+        n = 200
+        args = (
+            (np.arange(n) % 10 + 1).astype(np.int8),
+            (np.arange(n) % 13).astype(np.float64),
+            (np.arange(n) - 50).astype(np.int16),
+            np.arange(n) % 5 != 0,
+            (np.arange(n) % 4).astype(np.int32),
+            0.35, 0.35, 0.15, 0.15, 3, _LOG_MAX_PLUS1,
+        )
+        expected_scores, _ = _score_arrays(*args)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: score_kernel(*args), range(32)))
+        
+        for scores, _ in results:
+            np.testing.assert_array_equal(scores, expected_scores)
+    
+    def test_threaded_matches_serial(self):
+        """Test chunked thread-pool scoring matches a single NumPy pass"""
+        n = 5000
+        args = (
+            (np.arange(n) % 10 + 1).astype(np.int8),
+            (np.arange(n) % 13).astype(np.float64),
+            (np.arange(n) % 90 - 30).astype(np.int16),
+            np.arange(n) % 7 != 0,
+            (np.arange(n) % 4).astype(np.int32),
+            0.35, 0.35, 0.15, 0.15, 3, _LOG_MAX_PLUS1,
+        )
+        
+        with mock.patch('tasks.scoring.os.cpu_count', return_value=4):
+            scores, labels = _score_arrays_threaded(*args)
+        expected_scores, expected_labels = _score_arrays(*args)
+        
+        np.testing.assert_array_equal(scores, expected_scores)
+        np.testing.assert_array_equal(labels, expected_labels)
+    
+    def test_small_batches_skip_kernel(self):
+        """Test short task lists use the NumPy path, not the JIT kernel"""
+        tasks = [{'id': str(i), 'title': f'Task {i}'} for i in range(10)]
+        
+        with mock.patch('tasks.scoring.score_kernel') as kernel:
+            result = analyze_tasks(tasks)
+        
+        kernel.assert_not_called()
+        self.assertEqual(len(result['analyzed']), 10)
 
 
 class StrategyTests(TestCase):
@@ -440,6 +997,41 @@ class StrategyTests(TestCase):
         for strategy_name, weights in STRATEGIES.items():
             self.assertEqual(set(weights.keys()), required_keys,
                 f"{strategy_name} should have all weight keys")
+    
+    def test_multi_strategy_matches_single_runs(self):
+        """Test analyze_tasks_multi scores each strategy like analyze_tasks"""
+        tasks = [
+            {'id': f't{i}', 'title': f'Task {i}',
+             'due_date': (datetime.now() + timedelta(days=i - 5)).strftime('%Y-%m-%d'),
+             'estimated_hours': i % 6 + 0.5, 'importance': i % 10 + 1,
+             'dependencies': [f't{i - 1}'] if i else []}
+            for i in range(20)
+        ]
+        
+        multi = analyze_tasks_multi([dict(t) for t in tasks])
+        
+        self.assertEqual(set(multi), set(STRATEGIES))
+        for name, scores in multi.items():
+            self.assertEqual(scores.shape, (20,))
+            result = analyze_tasks([dict(t) for t in tasks], strategy=name, presanitized=True)
+            for row in result['analyzed']:
+                idx = int(row['id'][1:])
+                self.assertAlmostEqual(float(scores[idx]), row['score'], delta=0.011)
+    
+    def test_strategy_tuples_match_weights(self):
+        """Test the precomputed weight tuples mirror STRATEGIES"""
+        for strategy_name, weights in STRATEGIES.items():
+            self.assertEqual(
+                STRATEGY_TUPLES[strategy_name],
+                (weights['u'], weights['i'], weights['e'], weights['d']))
+    
+    def test_strategies_endpoint(self):
+        """Test /api/strategies/ serves the cached strategy table as JSON"""
+        response = self.client.get('/api/strategies/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['strategies'], STRATEGIES)
 
 
 class EdgeCaseTests(TestCase):
@@ -472,6 +1064,21 @@ class EdgeCaseTests(TestCase):
         self.assertLessEqual(analyzed['importance'], 10)
         self.assertGreaterEqual(analyzed['importance'], 1)
     
+    def test_extreme_due_dates_saturate(self):
+        """Test dates far outside the compact day range score like saturated ones"""
+        today = datetime.now().date()
+        tasks = [
+            {'id': 'ancient', 'title': 'Ancient', 'due_date': '0001-01-01'},
+            {'id': 'late', 'title': 'Late', 'due_date': (today - timedelta(days=30)).isoformat()},
+            {'id': 'distant', 'title': 'Distant', 'due_date': '9999-12-31'},
+            {'id': 'later', 'title': 'Later', 'due_date': (today + timedelta(days=60)).isoformat()},
+        ]
+        
+        scores = {t['id']: t['score'] for t in analyze_tasks(tasks)['analyzed']}
+        
+        self.assertEqual(scores['ancient'], scores['late'])
+        self.assertEqual(scores['distant'], scores['later'])
+    
     def test_very_long_task_list(self):
         """Test analyzing many tasks doesn't crash"""
         tasks = [
@@ -489,4 +1096,155 @@ class EdgeCaseTests(TestCase):
         result = analyze_tasks(tasks)
         
         self.assertEqual(len(result['analyzed']), 100)
+    
+    def test_long_dependency_chain(self):
+        """Test a 10,000-task dependency chain analyzes without recursion limits"""
+        n = 10000
+        tasks = [
+            {'id': f't{i}', 'title': f'Task {i}',
+             'dependencies': [f't{i + 1}'] if i + 1 < n else []}
+            for i in range(n)
+        ]
+        
+        result = analyze_tasks(tasks)
+        
+        self.assertEqual(result['total_tasks'], n)
+        self.assertIsNone(result['cycles'])
+        self.assertFalse(any(t['in_circular_dependency'] for t in result['analyzed']))
+
 
+class AnalyzeEndpointTests(TestCase):
+    """Test the /api/tasks/analyze/ endpoint"""
+    
+    def setUp(self):
+        self.payload = {
+            'strategy': 'fastest',
+            'tasks': [
+                {'id': 't1', 'title': 'Write report', 'due_date': '2025-12-10',
+                 'estimated_hours': 3, 'importance': 7, 'dependencies': []},
+                {'id': 't2', 'title': 'Email', 'estimated_hours': 0.5,
+                 'importance': 4, 'dependencies': ['t1']},
+            ],
+        }
+    
+    def test_returns_analysis_json(self):
+        """Test the endpoint returns the analyze_tasks result as JSON"""
+        response = self.client.post('/api/tasks/analyze/', self.payload,
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = response.json()
+        self.assertEqual(body['strategy'], 'fastest')
+        self.assertEqual(body['total_tasks'], 2)
+        self.assertEqual({t['id'] for t in body['analyzed']}, {'t1', 't2'})
+    
+    def test_fills_defaults_without_serializer(self):
+        """Test the default path passes raw tasks to analyze_tasks for defaulting"""
+        payload = {'tasks': [{'id': 't1', 'title': 'Bare task'}]}
+        
+        response = self.client.post('/api/tasks/analyze/', payload,
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        task = response.json()['analyzed'][0]
+        self.assertEqual(task['importance'], 5)
+        self.assertEqual(task['estimated_hours'], 1)
+    
+    def test_rejects_malformed_request(self):
+        """Test structural problems are reported per field"""
+        payload = {
+            'strategy': 'random',
+            'weights': {'u': 2},
+            'tasks': [{'id': 't1', 'title': 'Task', 'importance': 'high'}],
+        }
+        
+        response = self.client.post('/api/tasks/analyze/', payload,
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['details']), {'tasks', 'strategy', 'weights'})
+    
+    def test_rejects_non_list_dependencies(self):
+        """Test scalar 'dependencies' values get a 400, not a server error"""
+        for deps in (5, True, 'not-a-list'):
+            payload = {'tasks': [{'id': 't1', 'title': 'Task', 'dependencies': deps}]}
+            
+            response = self.client.post('/api/tasks/analyze/', payload,
+                                        content_type='application/json')
+            
+            self.assertEqual(response.status_code, 400, deps)
+            self.assertIn('tasks', response.json()['details'])
+    
+    def test_accepts_numeric_strings(self):
+        """Test numeric strings are coerced like the serializer's numeric fields did"""
+        payload = {
+            'weights': {'u': '0.25', 'i': '0.25', 'e': 0.25, 'd': 0.25},
+            'tasks': [{'id': 't1', 'title': 'Task', 'importance': '7',
+                       'estimated_hours': '2.5'}],
+        }
+        
+        response = self.client.post('/api/tasks/analyze/', payload,
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        task = response.json()['analyzed'][0]
+        self.assertEqual(task['importance'], 7)
+        self.assertEqual(task['estimated_hours'], 2.5)
+    
+    def test_empty_weights_use_strategy(self):
+        """Test an empty weights dict is treated as no custom weights, strict or not"""
+        payload = {'weights': {}, 'tasks': [{'id': 't1', 'title': 'Task'}]}
+        
+        for url in ('/api/tasks/analyze/', '/api/tasks/analyze/?strict=1'):
+            response = self.client.post(url, payload, content_type='application/json')
+            
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.json()['weights'], STRATEGIES['smart_balance'], url)
+    
+    def test_rejects_empty_task_list(self):
+        """Test an empty or missing task list is rejected"""
+        response = self.client.post('/api/tasks/analyze/', {'tasks': []},
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 400)
+    
+    def test_strict_mode_uses_serializer(self):
+        """Test ?strict=1 applies the serializer's field validation"""
+        self.payload['tasks'][0]['due_date'] = '12/10/2025'
+        
+        lenient = self.client.post('/api/tasks/analyze/', self.payload,
+                                   content_type='application/json')
+        strict = self.client.post('/api/tasks/analyze/?strict=1', self.payload,
+                                  content_type='application/json')
+        
+        self.assertEqual(lenient.status_code, 200)
+        self.assertEqual(strict.status_code, 400)
+        self.assertIn('tasks', strict.json()['details'])
+
+
+class SuggestEndpointTests(TestCase):
+    """Test the /api/tasks/suggest/ endpoint"""
+    
+    def test_returns_top_three(self):
+        """Test raw tasks are validated, defaulted and cut to three suggestions"""
+        payload = {'tasks': [
+            {'id': f't{i}', 'title': f'Task {i}', 'importance': i + 1} for i in range(6)
+        ]}
+        
+        response = self.client.post('/api/tasks/suggest/', payload,
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['total_tasks'], 6)
+        self.assertEqual([s['id'] for s in body['suggestions']], ['t5', 't4', 't3'])
+        self.assertEqual([s['rank'] for s in body['suggestions']], [1, 2, 3])
+    
+    def test_rejects_malformed_request(self):
+        """Test the suggest endpoint shares the analyze endpoint's validation"""
+        response = self.client.post('/api/tasks/suggest/', {'tasks': 'not a list'},
+                                    content_type='application/json')
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tasks', response.json()['details'])
@@ -2,6 +2,11 @@
 API Views for task analysis and suggestions.
 """
 
+import json
+import math
+
+import orjson
+from django.http import HttpResponse
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
@@ -10,12 +15,118 @@ from .serializers import AnalyzeRequestSerializer
 from .scoring import analyze_tasks, get_top_suggestions, STRATEGIES
 
 
+# The strategy table is static, so its JSON body is rendered once at import
+_STRATEGIES_RESPONSE = json.dumps({
+    'strategies': STRATEGIES,
+    'descriptions': {
+        'smart_balance': 'Balanced approach considering all factors equally',
+        'fastest': 'Prioritizes quick wins - tasks that take less time',
+        'high_impact': 'Prioritizes importance over other factors',
+        'deadline': 'Prioritizes urgent tasks based on due dates',
+    }
+})
+
+
+def _is_number(value) -> bool:
+    """
+    True for finite numbers and numeric strings, i.e. what float() accepts
+    (and the serializer's numeric fields coerced). Booleans are rejected.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return False
+    try:
+        return math.isfinite(float(value))
+    except (ValueError, OverflowError):
+        return False
+
+
+def _check_request(data) -> dict:
+    """
+    Cheap structural check of an analyze request body.
+    
+    Returns a dict of field -> error messages (empty when the body is usable).
+    """
+    if not isinstance(data, dict):
+        return {'non_field_errors': ['Request body must be a JSON object']}
+    
+    errors = {}
+    tasks = data.get('tasks')
+    if not isinstance(tasks, list) or not tasks:
+        errors['tasks'] = ['At least one task is required']
+    else:
+        for idx, task in enumerate(tasks):
+            if not isinstance(task, dict):
+                problem = 'must be an object'
+            elif not isinstance(task.get('id', ''), str) or not isinstance(task.get('title', ''), str):
+                problem = "'id' and 'title' must be strings"
+            elif not isinstance(task.get('due_date') or '', str):
+                problem = "'due_date' must be a YYYY-MM-DD string"
+            elif any(task.get(field) is not None and not _is_number(task[field])
+                     for field in ('importance', 'estimated_hours')):
+                problem = "'importance' and 'estimated_hours' must be numbers"
+            elif task.get('dependencies') is not None and (
+                    not isinstance(task['dependencies'], list)
+                    or not all(isinstance(dep_id, str) for dep_id in task['dependencies'])):
+                problem = "'dependencies' must be a list of task ids"
+            else:
+                continue
+            errors.setdefault('tasks', []).append(f"Task at index {idx}: {problem}")
+    
+    strategy = data.get('strategy')
+    if strategy is not None and (not isinstance(strategy, str) or strategy not in STRATEGIES):
+        errors['strategy'] = [f"Unknown strategy '{strategy}'"]
+    
+    weights = data.get('weights')
+    # An empty dict means "no custom weights", as in the serializer
+    if weights is not None and weights != {}:
+        if (not isinstance(weights, dict) or not {'u', 'i', 'e', 'd'} <= weights.keys()
+                or not all(_is_number(val) and 0 <= float(val) <= 1 for val in weights.values())):
+            errors['weights'] = ["Weights must map 'u', 'i', 'e', 'd' to numbers between 0 and 1"]
+    
+    return errors
+
+
+def _validate(data, strict: bool = False):
+    """
+    Validate an analyze/suggest request body.
+    
+    By default only the cheap structural check runs, and analyze_tasks is
+    left to default and clamp the raw tasks. ``strict`` runs the full
+    AnalyzeRequestSerializer instead, whose output analyze_tasks can trust.
+    
+    Returns:
+        Tuple of (tasks, strategy, weights, errors); errors is empty on success
+    """
+    if strict:
+        serializer = AnalyzeRequestSerializer(data=data)
+        if not serializer.is_valid():
+            return None, None, None, serializer.errors
+        validated_data = serializer.validated_data
+        return (validated_data['tasks'], validated_data.get('strategy', 'smart_balance'),
+                validated_data.get('weights'), {})
+    
+    errors = _check_request(data)
+    if errors:
+        return None, None, None, errors
+    weights = data.get('weights') or None
+    if weights is not None:
+        # Numeric strings are accepted above; the scorer needs real floats
+        weights = {key: float(val) for key, val in weights.items()}
+    return data['tasks'], data.get('strategy') or 'smart_balance', weights, {}
+
+
+def _is_strict(request) -> bool:
+    return request.query_params.get('strict') in ('1', 'true')
+
+
 @api_view(['POST'])
 def analyze_tasks_view(request):
     """
     POST /api/tasks/analyze/
     
     Accept a list of tasks and return them sorted by priority score.
+    Pass ?details=1 to include each task's per-component score breakdown,
+    and ?strict=1 to validate every task field with AnalyzeRequestSerializer.
     
     Request body:
     {
@@ -32,23 +143,24 @@ def analyze_tasks_view(request):
         "weights": {...}
     }
     """
-    serializer = AnalyzeRequestSerializer(data=request.data)
-    
-    if not serializer.is_valid():
+    strict = _is_strict(request)
+    tasks, strategy, custom_weights, errors = _validate(request.data, strict)
+    if errors:
         return Response({
             'error': 'Invalid request data',
-            'details': serializer.errors
+            'details': errors
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    validated_data = serializer.validated_data
-    tasks = validated_data['tasks']
-    strategy = validated_data.get('strategy', 'smart_balance')
-    custom_weights = validated_data.get('weights')
+    include_details = request.query_params.get('details') in ('1', 'true')
     
     # Analyze tasks
-    result = analyze_tasks(tasks, strategy=strategy, custom_weights=custom_weights)
+    result = analyze_tasks(tasks, strategy=strategy, custom_weights=custom_weights,
+                           presanitized=strict, include_details=include_details)
     
-    return Response(result, status=status.HTTP_200_OK)
+    # Large task lists make this payload the biggest one the API returns;
+    # orjson encodes it (NumPy values included) much faster than DRF's renderer
+    return HttpResponse(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY),
+                        content_type='application/json')
 
 
 @api_view(['GET', 'POST'])
@@ -58,24 +170,20 @@ def suggest_tasks_view(request):
     
     Return the top 3 tasks to work on with explanations.
     
-    For POST, accepts same body as analyze endpoint.
+    For POST, accepts same body (and ?strict=1) as analyze endpoint.
     For GET, expects tasks and strategy as query params (limited functionality).
     """
     if request.method == 'POST':
         # Use POST body
-        serializer = AnalyzeRequestSerializer(data=request.data)
+        strict = _is_strict(request)
+        tasks, strategy, custom_weights, errors = _validate(request.data, strict)
         
-        if not serializer.is_valid():
+        if errors:
             return Response({
                 'error': 'Invalid request data',
-                'details': serializer.errors
+                'details': errors
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        validated_data = serializer.validated_data
-        tasks = validated_data['tasks']
-        strategy = validated_data.get('strategy', 'smart_balance')
-        custom_weights = validated_data.get('weights')
-        
     else:
         # GET method - expect minimal query params
         strategy = request.query_params.get('strategy', 'smart_balance')
@@ -90,13 +198,14 @@ def suggest_tasks_view(request):
             }
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Analyze and get suggestions
-    result = analyze_tasks(tasks, strategy=strategy, custom_weights=custom_weights)
+    # Analyze and get suggestions; only the top 3 rows are built
+    result = analyze_tasks(tasks, strategy=strategy, custom_weights=custom_weights,
+                           presanitized=strict, top_n=3)
     suggestions = get_top_suggestions(result, count=3)
     
     return Response({
         'suggestions': suggestions,
-        'total_tasks': len(result['analyzed']),
+        'total_tasks': result['total_tasks'],
         'strategy': result['strategy'],
         'warnings': result['warnings'],
     }, status=status.HTTP_200_OK)
@@ -109,13 +218,4 @@ def strategies_view(request):
     
     Return available strategies and their weights.
     """
-    return Response({
-        'strategies': STRATEGIES,
-        'descriptions': {
-            'smart_balance': 'Balanced approach considering all factors equally',
-            'fastest': 'Prioritizes quick wins - tasks that take less time',
-            'high_impact': 'Prioritizes importance over other factors',
-            'deadline': 'Prioritizes urgent tasks based on due dates',
-        }
-    }, status=status.HTTP_200_OK)
-
+    return HttpResponse(_STRATEGIES_RESPONSE, content_type='application/json')
@@ -118,12 +118,14 @@ function handleLoadJson() {
             }
         }
         
-        // Add tasks (check for duplicates)
+        // Add tasks (check for duplicates with a Set instead of scanning the list per task)
+        const existingIds = new Set(tasks.map(t => t.id));
         let added = 0;
         let skipped = 0;
         
         for (const task of parsedTasks) {
-            if (!tasks.find(t => t.id === task.id)) {
+            if (!existingIds.has(task.id)) {
+                existingIds.add(task.id);
                 tasks.push(task);
                 added++;
             } else {